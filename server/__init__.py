@@ -3,11 +3,17 @@ import os
 from flask import Flask
 
 
-def create_app():
-    """Flask application factory. Constructs a Flask instance."""
+def create_app(test_config=None):
+    """Flask application factory. Constructs a Flask instance.
+
+    :param test_config: mapping of config values that override the defaults
+    """
     app = Flask(__name__, instance_relative_config=True)
     app.config["DATABASE"] = os.path.join(app.instance_path, "tissue.sqlite")
 
+    if test_config is not None:
+        app.config.from_mapping(test_config)
+
     try:
         os.makedirs(app.instance_path)
     except OSError:
@@ -1,204 +1,253 @@
 import functools
+import itertools
+import json
+import re
+import sqlite3
 
-from flask import Blueprint
-from server.models.database import get_database
+import fastjsonschema
+import orjson
+from flask import Blueprint, current_app, request
+from server.models.database import get_database, transaction
 
 blueprint = Blueprint("issue", __name__)
 
+# Shared by every helper that adds tags, so that sqlite3's statement cache
+# serves all of them from a single prepared statement.
+INSERT_TAG_SQL = """
+INSERT INTO tag (namespace, predicate, value, issue_id)
+VALUES (?, ?, ?, ?)
+"""
+
+# Range of rowids; SQLite falls back to random rowids once the largest has
+# been assigned.
+MIN_ROWID = -2 ** 63
+MAX_ROWID = 2 ** 63 - 1
+
+# Text that SQLite reads as an integer or a decimal when it is given to a
+# column with INTEGER affinity.
+NUMERIC_TEXT_PATTERN = re.compile(
+    r"\s*[+-]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][+-]?[0-9]+)?\s*",
+    re.ASCII,
+)
 
-def validate_request_payload(
+# Selects each issue with its tags assembled into a single JSON document by
+# SQLite, so an issue comes back as one row rather than one row per tag. The
+# subquery is wrapped in json() so that its result is embedded as an array
+# rather than as a string on SQLite versions that drop the JSON subtype of
+# subquery results. Tags are aggregated over a derived table ordered by tag
+# id so that they keep their insertion order; otherwise they would come
+# back in the order of the covering index. Callers append a WHERE clause.
+SELECT_ISSUE_JSON_SQL = """
+SELECT
+    issue.id,
+    json_object(
+        'id', issue.id,
+        'title', issue.title,
+        'description', issue.description,
+        'tags', json((
+            SELECT
+                json_group_array(json_object(
+                    'namespace', namespace,
+                    'predicate', predicate,
+                    'value', value
+                ))
+            FROM (
+                SELECT
+                    namespace,
+                    predicate,
+                    value
+                FROM
+                    tag
+                WHERE
+                    tag.issue_id = issue.id
+                ORDER BY
+                    tag.id
+            )
+        ))
+    ) AS issue
+FROM
+    issue
+"""
+
+
+def build_request_schema(
     require_issue_title=False,
     require_issue_id=False,
     require_tag_fields=False,
 ):
-    """Validate JSON request payload for `/api/issue/*` endpoints.
+    """Build the JSON schema for issue request payloads.
 
     :param require_issue_title: issue 'title' field is required
     :param require_issue_id: 'id' field in issue is required
     :param require_tag_fields: 'namespace', 'predicate', 'value' are required
-    :raise 400: payload is invalid
+    :return: JSON schema dict
     """
-    def decorator(func):
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-
-            # Schema for GET, POST, and PUT methods.
-            request_schema = {
-                "$schema": "http://json-schema.org/draft-07/schema#",
-                "definitions": {
-                    "tag": {
-                        "type": "object",
-                        "required": [],
-                        "properties": {
-                            "namespace": {
-                                "description": "Tag namespace.",
-                                "type": "string",
-                            },
-                            "predicate": {
-                                "description": "Tag predicate.",
-                                "type": "string",
-                            },
-                            "value": {
-                                "description": "Tag value.",
-                                "type": ["number", "string"],
-                            },
-                        },
+    request_schema = {
+        "$schema": "http://json-schema.org/draft-07/schema#",
+        "definitions": {
+            "tag": {
+                "type": "object",
+                "required": [],
+                "properties": {
+                    "namespace": {
+                        "description": "Tag namespace.",
+                        "type": "string",
                     },
-                    "issue": {
-                        "type": "object",
-                        "required": [],
-                        "properties": {
-                            "title": {
-                                "description": "Issue title.",
-                                "type": "string",
-                            },
-                            "description": {
-                                "description": "Issue description.",
-                                "type": "string",
-                            },
-                            "tags": {
-                                "type": "array",
-                                "default": [],
-                                "minItems": 0,
-                                "items": {
-                                    "$ref": "#/definitions/tag",
-                                },
-                            },
-                        },
+                    "predicate": {
+                        "description": "Tag predicate.",
+                        "type": "string",
                     },
-                },
-                "oneOf": [
-                    {
-                        "type": "array",
-                        "minItems": 1,
-                        "items": {
-                            "$ref": "#/definitions/issue",
-                        },
+                    "value": {
+                        "description": "Tag value.",
+                        "type": ["number", "string"],
                     },
-                    {
-                        "$ref": "#/definitions/issue",
-                    },
-                ],
-            }
-
-            if require_issue_title:
-                # 'description' will always be an optional field.
-                request_schema["definitions"]["issue"]["required"] = ["title"]
-
-            if require_issue_id:
-                request_schema["definitions"]["issue"]["required"].append("id")
-                request_schema["definitions"]["issue"]["properties"]["id"] = {
-                    "type": ["integer", "string"],
-                }
-
-            if require_tag_fields:
-                request_schema["definitions"]["tag"]["required"] = [
-                    "namespace", "predicate", "value",
-                ]
-
-            # Schema for PATCH method. Slightly modified from the official RFC
-            # 6902 specification schema to allow for patching a list of issues.
-            # http://json.schemastore.org/json-patch
-            json_patch_schema = {
-                "title": "JSON schema for JSONPatch files",
-                "$schema": "http://json-schema.org/draft-04/schema#",
-                "type": "array",
-                "definitions": {
-                    "operation": {
-                        "type": "object",
-                        "required": ["op", "path"],
-                        "allOf": [
-                            {
-                                "$ref": "#/definitions/path",
-                            },
-                        ],
-                        "oneOf": [
-                            {
-                                "required": ["value"],
-                                "properties": {
-                                    "op": {
-                                        "type": "string",
-                                        "enum": ["add", "replace", "test"],
-                                    },
-                                    "value": {
-                                        "description": \
-                                            "The value to add, replace or test."
-                                    },
-                                },
-                            },
-                            {
-                                "properties": {
-                                    "op": {
-                                        "description": \
-                                            "The operation to perform.",
-                                        "type": "string",
-                                        "enum": ["remove"],
-                                    },
-                                },
-                            },
-                            {
-                                "required": ["from"],
-                                "properties": {
-                                    "op": {
-                                        "description": \
-                                            "The operation to perform.",
-                                        "type": "string",
-                                        "enum": ["move", "copy"],
-                                    },
-                                    "from": {
-                                        "description": \
-                                            "A JSON Pointer path pointing to "
-                                            "the location to move/copy from.",
-                                        "type": "string",
-                                    },
-                                },
-                            },
-                        ],
+                },
+            },
+            "issue": {
+                "type": "object",
+                "required": [],
+                "properties": {
+                    "title": {
+                        "description": "Issue title.",
+                        "type": "string",
                     },
-                    "path": {
-                        "properties": {
-                            "path": {
-                                "description": "A JSON Pointer path.",
-                                "type": "string",
-                            },
-                        },
+                    "description": {
+                        "description": "Issue description.",
+                        "type": "string",
                     },
-                    "patch": {
+                    "tags": {
                         "type": "array",
                         "default": [],
+                        "minItems": 0,
                         "items": {
-                            "$ref": "#/definitions/operation",
+                            "$ref": "#/definitions/tag",
                         },
                     },
                 },
-                "oneOf": [
-                    {
-                        "type": "array",
-                        "minItems": 1,
-                        "items": {
-                            "$ref": "#/definitions/patch",
-                        },
-                    },
-                    {
-                        "$ref": "#/definitions/patch",
-                    },
-                ],
-            }
+            },
+        },
+        "oneOf": [
+            {
+                "type": "array",
+                "minItems": 1,
+                "items": {
+                    "$ref": "#/definitions/issue",
+                },
+            },
+            {
+                "$ref": "#/definitions/issue",
+            },
+        ],
+    }
 
-            try:
-                if request.method == "PUT":
-                    request_schema = json_patch_schema
+    # Each variant gets its own 'required' list rather than appending to a
+    # list that another variant might share. 'description' will always be an
+    # optional field.
+    request_schema["definitions"]["issue"]["required"] = [
+        *(["title"] if require_issue_title else []),
+        *(["id"] if require_issue_id else []),
+    ]
 
-                validate(
-                    instance=request.get_json(),
-                    schema=request_schema,
-                )
+    if require_issue_id:
+        request_schema["definitions"]["issue"]["properties"]["id"] = {
+            "type": ["integer", "string"],
+        }
+
+    if require_tag_fields:
+        request_schema["definitions"]["tag"]["required"] = [
+            "namespace", "predicate", "value",
+        ]
+
+    return request_schema
+
+
+def compile_schema(schema):
+    """Generate a validation function specialized to a JSON schema.
 
-            except ValidationError:
+    Defaults declared in the schema are not written back into the validated
+    payload.
+
+    :param schema: JSON schema dict
+    :raise JsonSchemaDefinitionException: schema is invalid
+    :return: function that validates a payload against the schema
+    """
+    return fastjsonschema.compile(schema, use_default=False)
+
+
+# Validators are compiled once at import time rather than on every request.
+# Request validators are indexed by the (require_issue_title, require_issue_id,
+# require_tag_fields) flags of `validate_request_payload`, packed into a 3-bit
+# integer in that order (see `request_validator_index`).
+REQUEST_VALIDATORS = tuple(
+    compile_schema(build_request_schema(*flags))
+    for flags in itertools.product([False, True], repeat=3)
+)
+
+
+def request_validator_index(
+    require_issue_title=False,
+    require_issue_id=False,
+    require_tag_fields=False,
+):
+    """Pack validation flags into an index into `REQUEST_VALIDATORS`.
+
+    :param require_issue_title: issue 'title' field is required
+    :param require_issue_id: 'id' field in issue is required
+    :param require_tag_fields: 'namespace', 'predicate', 'value' are required
+    :return: integer in range(8)
+    """
+    return (
+        bool(require_issue_title) << 2
+        | bool(require_issue_id) << 1
+        | bool(require_tag_fields)
+    )
+
+
+def validate_request_payload(
+    require_issue_title=False,
+    require_issue_id=False,
+    require_tag_fields=False,
+):
+    """Validate JSON request payload for `/api/issue/*` endpoints.
+
+    The decoded payload is passed to the decorated route as its first
+    argument.
+
+    :param require_issue_title: issue 'title' field is required
+    :param require_issue_id: 'id' field in issue is required
+    :param require_tag_fields: 'namespace', 'predicate', 'value' are required
+    :raise 400: payload is invalid
+    """
+    # Resolve the compiled validator once per decorated route.
+    request_validator = REQUEST_VALIDATORS[request_validator_index(
+        require_issue_title,
+        require_issue_id,
+        require_tag_fields,
+    )]
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # Bodies without a JSON content type are rejected before they are
+            # decoded, as request.get_json() did. Otherwise a text/plain POST
+            # would be a CORS simple request that any site could send
+            # without a preflight.
+            if not request.is_json:
+                errors = ["invalid json payload"]
+                return payload({}, errors, 400)
+
+            try:
+                body = orjson.loads(request.get_data(cache=False))
+                request_validator(body)
+
+            except (
+                orjson.JSONDecodeError,
+                fastjsonschema.JsonSchemaException,
+            ):
                 errors = ["invalid json payload"]
                 return payload({}, errors, 400)
 
-            return func(*args, **kwargs)
+            return func(body, *args, **kwargs)
         return wrapper
     return decorator
 
@@ -210,27 +259,55 @@ def payload(data={}, errors=[], status_code=200):
     :param errors: list of errors
     :param status_code: http status code
     """
-    return jsonify({
-        "data": data,
-        "errors": errors,
-    }), status_code
+    return current_app.response_class(
+        orjson.dumps({
+            "data": data,
+            "errors": errors,
+        }),
+        status=status_code,
+        mimetype="application/json",
+    )
 
 
-def to_issue_list(request):
+def to_issue_list(body):
     """Normalizes the request payload body.
 
     Clients are allowed to send a payload containing a single issue (dict) or
     multiple issues (list of dict). This function converts dict payloads into
     list of dict payloads.
 
-    :param request: Flask request
+    :param body: decoded JSON request body
     :return: list of issues
     """
-    payload = request.get_json()
-    if type(payload) == dict:
-        payload = [payload]
+    return body if isinstance(body, list) else [body]
+
+
+def normalize_issue_id(id):
+    """Normalizes an issue id to the value SQLite stores it as.
+
+    Issue ids are INTEGER PRIMARY KEYs, so SQLite converts a string that
+    holds an integer, or a decimal equal to an integer (such as "1.0"), to
+    that integer, as long as it fits in 64 bits. Converting such strings up
+    front lets ids from the payload be compared with ids read from SQLite.
+    Any other value is returned unchanged, for SQLite to reject on write.
+
+    :param id: issue id from a request payload
+    :return: integer id if SQLite would store `id` as one; otherwise `id`
+    """
+    if not isinstance(id, str) or not NUMERIC_TEXT_PATTERN.fullmatch(id):
+        return id
+
+    try:
+        number = int(id)
+    except ValueError:
+        # SQLite reads decimals as REALs, which become integers only if no
+        # precision is lost.
+        number = float(id)
+        if not number.is_integer():
+            return id
+        number = int(number)
 
-    return payload
+    return number if MIN_ROWID <= number <= MAX_ROWID else id
 
 
 @blueprint.route("/api/issue/<int:id>", methods=["GET"])
@@ -241,9 +318,10 @@ def get_issue_route(id):
     :raise 404: issue not found
     :raise 500: unexpected server error
     """
+    errors = []
+
     try:
-        database = get_database().cursor()
-        issue = get_issue(cursor, id)
+        issue = get_issue(get_database().cursor(), id)
 
     except Exception as error:
         errors.append("unexpected server error")
@@ -251,7 +329,7 @@ def get_issue_route(id):
         return payload({}, errors, 500)
 
     if issue is None:
-        errors = [f"issue #{id} does not exist"]
+        errors.append(f"issue #{id} does not exist")
         return payload(errors=errors, status_code=404)
 
     return payload(issue)
@@ -264,51 +342,43 @@ def get_issue(cursor, id):
     :param id: issue id
     :return: issue if it exists; otherwise None.
     """
+    cursor.execute(SELECT_ISSUE_JSON_SQL + "WHERE issue.id = ?", (id,))
+    row = cursor.fetchone()
+    return orjson.loads(row["issue"]) if row else None
+
+
+def get_issues(cursor, ids):
+    """Helper function that fetches a batch of issues from SQLite.
+
+    :param cursor: sqlite3 cursor
+    :param ids: list of issue ids
+    :return: dict of the issues that exist, keyed by issue id
+    """
     cursor.execute(
-        """
-        SELECT
-            issue.id,
-            issue.title,
-            issue.description,
-            tag.namespace,
-            tag.predicate,
-            tag.value
-        FROM
-            issue
-            LEFT JOIN
-                tag
-                ON issue.id = tag.issue_id
-        WHERE
-            issue.id = ?
-
-        """, (id,),
+        SELECT_ISSUE_JSON_SQL +
+        "WHERE issue.id IN (SELECT value FROM json_each(?))",
+        (json.dumps(ids),),
     )
 
-    issue = None
-    for row in cursor:
-        # Initialize issue dict.
-        if issue is None:
-            issue = {
-                "id": row["id"],
-                "title": row["title"],
-                "description": row["description"],
-                "tags": [],
-            }
-
-        # We can assume that a row contains a tag if any of its tag
-        # fields are non-empty strings. This is enforced by a CHECK
-        # constraint defined in the database schema.
-        contains_tag = lambda r: bool(row["value"])
-
-        # Add tag to issue.
-        if contains_tag:
-            issue["tags"].append({
-                "namespace": row["namespace"],
-                "predicate": row["predicate"],
-                "value": row["value"],
-            })
-
-    return issue
+    return {row["id"]: orjson.loads(row["issue"]) for row in cursor}
+
+
+def get_existing_issue_ids(cursor, ids):
+    """Helper function that checks which issues exist in SQLite.
+
+    The ids are bound as a single JSON array parameter so that the same
+    statement is used regardless of how many ids are being checked.
+
+    :param cursor: sqlite3 cursor
+    :param ids: list of issue ids
+    :return: set of ids of the issues that exist
+    """
+    cursor.execute(
+        "SELECT id FROM issue WHERE id IN (SELECT value FROM json_each(?))",
+        (json.dumps(ids),),
+    )
+
+    return {row["id"] for row in cursor}
 
 
 @blueprint.route("/api/issue", methods=["POST"])
@@ -317,191 +387,284 @@ def get_issue(cursor, id):
     require_issue_id=True,
     require_tag_fields=True,
 )
-def post_issue_route():
+def post_issue_route(body):
     """Create one or more issues.
 
+    :param body: decoded JSON request body
     :raise 400: created issue violates integrity checks
     :raise 500: unexpected server error
     """
     database = get_database()
-    created_issues = []
     errors = []
 
-    with database:
-        try:
-            for issue in to_issue_list(request):
-                created_issue = create_issue(database.cursor(), issue)
-                created_issues.append(created_issue)
+    # An empty batch has nothing to write, so it does not take the write
+    # lock. The request schemas already reject empty lists; this keeps the
+    # routes from opening a transaction should that ever change.
+    issues = to_issue_list(body)
+    if not issues:
+        return payload([])
+
+    try:
+        with transaction(database):
+            created_issues = create_issues(database.cursor(), issues)
 
             # TODO: Validate database state against Prolog rules.
 
-        except sqlite3.IntegrityError as error:
-            errors.append("failed to create rows in sqlite")
-            errors.append(str(error))
-            return payload({}, errors, 400)
+    except sqlite3.IntegrityError as error:
+        errors.append("failed to create rows in sqlite")
+        errors.append(str(error))
+        return payload({}, errors, 400)
 
-        except Exception as error:
-            errors.append("unexpected server error")
-            errors.append(str(error))
-            return payload({}, errors, 500)
+    except Exception as error:
+        errors.append("unexpected server error")
+        errors.append(str(error))
+        return payload({}, errors, 500)
 
     return payload(created_issues)
 
 
-def create_issue(cursor, issue):
-    """Helper function that creates an issue in SQLite.
+def create_issues(cursor, issues):
+    """Helper function that creates a batch of issues in SQLite.
 
     :param cursor: sqlite3 cursor
-    :param issue: issue dict
-    :return: original issue dict with additional id field
+    :param issues: list of issue dicts
+    :return: original issue dicts with additional id fields
     """
-    cursor.execute(
-        "INSERT INTO issue (title, description) VALUES (?, ?)",
-        (issue["title"], issue.get("description", "")),
-    )
-
-    issue_id = cursor.lastrowid
-    for tag in issue.get("tags", []):
-        cursor.execute(
-            """
-            INSERT INTO tag (namespace, predicate, value, issue_id)
-            VALUES (?, ?, ?, ?)
-            """, (
-                tag.get("namespace", ""),
-                tag.get("predicate", ""),
-                tag.get("value", ""),
-                issue_id,
-            ),
+    insert_issue_sql = "INSERT INTO issue (title, description) VALUES (?, ?)"
+    issue_rows = [
+        (issue["title"], issue.get("description", "")) for issue in issues
+    ]
+
+    # SQLite assigns each new row the current maximum rowid plus one, so
+    # within a single write transaction the batch receives a contiguous range
+    # of ids following the maximum rowid. Once that range would pass the
+    # largest possible rowid, SQLite picks new rowids at random instead, and
+    # each id has to be read back as its row is inserted.
+    cursor.execute("SELECT COALESCE(MAX(id), 0) FROM issue")
+    first_issue_id = cursor.fetchone()[0] + 1
+    if first_issue_id + len(issues) - 1 <= MAX_ROWID:
+        cursor.executemany(insert_issue_sql, issue_rows)
+        issue_ids = range(first_issue_id, first_issue_id + len(issues))
+    else:
+        issue_ids = []
+        for issue_row in issue_rows:
+            cursor.execute(insert_issue_sql, issue_row)
+            issue_ids.append(cursor.lastrowid)
+
+    cursor.executemany(INSERT_TAG_SQL, [
+        (
+            tag.get("namespace", ""),
+            tag.get("predicate", ""),
+            tag.get("value", ""),
+            issue_id,
         )
+        for issue_id, issue in zip(issue_ids, issues)
+        for tag in issue.get("tags", [])
+    ])
 
-    return {**issue, "id": issue_id}
+    return [
+        {**issue, "id": issue_id}
+        for issue_id, issue in zip(issue_ids, issues)
+    ]
 
 
 @blueprint.route("/api/issue", methods=["PUT"])
 @validate_request_payload(require_issue_id=True)
-def put_issue_route():
-    """Replace one or more issues.
+def put_issue_route(body):
+    """Create or replace one or more issues.
 
+    :param body: decoded JSON request body
     :raise 400: created issue violates integrity checks
     :raise 500: unexpected server error
     """
     database = get_database()
-    updated_issues = []
     errors = []
 
-    with database:
-        try:
-            cursor = database.cursor()
-            for issue in to_issue_list(request):
-                # Check if the issue exists in the database.
-                if get_issue(cursor, issue["id"]) is None:
-                    create_issue(cursor, issue)
-                else:
-                    # PUT has replace semantics so we must ensure that all
-                    # fields are being updated. For updating a subset of
-                    # fields, PATCH should be used.
-                    if "title" not in issue:
-                        issue["title"] = ""
-                    if "description" not in issue:
-                        issue["description"] = ""
-                    if "tags" not in issue:
-                        issue["tags"] = []
-
-                    updated_issues.append(
-                        replace_issue(
-                            cursor,
-                            issue["id"],
-                            issue,
-                        ),
-                    )
+    issues = to_issue_list(body)
+    if not issues:
+        return payload([])
+
+    try:
+        with transaction(database):
+            for issue in issues:
+                issue["id"] = normalize_issue_id(issue["id"])
+
+            # Collapse repeated ids so each issue is written once; the last
+            # occurrence in the payload wins.
+            issues = list({issue["id"]: issue for issue in issues}.values())
+
+            # PUT has replace semantics so we must ensure that all fields are
+            # being updated. For updating a subset of fields, PATCH should be
+            # used.
+            for issue in issues:
+                issue.setdefault("title", "")
+                issue.setdefault("description", "")
+                issue.setdefault("tags", [])
+
+            replaced_issues = replace_issues(database.cursor(), issues)
 
             # TODO: Validate database state against Prolog rules.
 
-        except sqlite3.IntegrityError as error:
-            errors.append("failed to create rows in sqlite")
-            errors.append(str(error))
-            return payload({}, errors, 400)
+    except sqlite3.IntegrityError as error:
+        errors.append("failed to create rows in sqlite")
+        errors.append(str(error))
+        return payload({}, errors, 400)
 
-        except Exception as error:
-            errors.append("unexpected server error")
-            errors.append(str(error))
-            return payload({}, errors, 500)
+    except Exception as error:
+        errors.append("unexpected server error")
+        errors.append(str(error))
+        return payload({}, errors, 500)
 
-    return updated_issues
+    return payload(replaced_issues)
 
 
-def replace_issue(cursor, id, fields):
-    """Helper function that replaces an issue in SQLite.
+def replace_issues(cursor, issues):
+    """Helper function that creates or replaces a batch of issues in SQLite.
+
+    Issues are written under the id they are given: an issue that does not
+    exist yet is created, and an existing issue has its fields and tags
+    replaced.
 
     :param cursor: sqlite3 cursor
-    :param id: issue id
-    :param fields: dict of fields values
+    :param issues: list of issue dicts with every field present
+    :return: replaced issues
     """
-    # Update issue fields.
-    cursor.execute(
-        f"UPDATE issue SET title = ?, description = ? WHERE id = ?",
-        (fields["title"], fields["description"], str(id)),
+    cursor.executemany(
+        """
+        INSERT INTO issue (id, title, description) VALUES (?, ?, ?)
+        ON CONFLICT (id) DO UPDATE SET
+            title = excluded.title,
+            description = excluded.description
+        """, [
+            (issue["id"], issue["title"], issue["description"])
+            for issue in issues
+        ],
     )
 
-    # Update issue tags.
-    cursor.execute("DELETE FROM tag WHERE issue_id = ?", (str(id),))
-    for tag in fields.get("tags", []):
-        cursor.execute(
-            """
-            INSERT INTO tag (namespace, predicate, value, issue_id)
-            VALUES (?, ?, ?, ?)
-            """, (
-                tag["namespace"],
-                tag["predicate"],
-                tag["value"],
-                str(id),
-            ),
-        )
-
-    return get_issue(cursor, id)
+    # Replace issue tags.
+    cursor.executemany(
+        "DELETE FROM tag WHERE issue_id = ?",
+        [(issue["id"],) for issue in issues],
+    )
+    cursor.executemany(INSERT_TAG_SQL, [
+        (tag["namespace"], tag["predicate"], tag["value"], issue["id"])
+        for issue in issues
+        for tag in issue["tags"]
+    ])
+
+    # Every column of the issues and their tags was just written, so the
+    # replaced issues are built from the input rather than fetched back.
+    # Numeric tag values are the exception: SQLite converts them to TEXT
+    # with its own formatting, which differs from Python's str() for reals
+    # (0.1 + 0.2 is stored as "0.3"), so issues with numeric tag values are
+    # read back to return what was stored.
+    stored_ids = [
+        issue["id"]
+        for issue in issues
+        if any(not isinstance(tag["value"], str) for tag in issue["tags"])
+    ]
+    stored_issues = get_issues(cursor, stored_ids) if stored_ids else {}
+
+    return [
+        stored_issues.get(issue["id"]) or {
+            "id": issue["id"],
+            "title": issue["title"],
+            "description": issue["description"],
+            "tags": [
+                {
+                    "namespace": tag["namespace"],
+                    "predicate": tag["predicate"],
+                    "value": tag["value"],
+                }
+                for tag in issue["tags"]
+            ],
+        }
+        for issue in issues
+    ]
 
 
 @blueprint.route("/api/issue<int:id>", methods=["PATCH"])
 @validate_request_payload()
-def patch_issue_route(id):
+def patch_issue_route(body, id):
     """Patch an issue.
 
+    :param body: decoded JSON request body
     :raise 400: created issue violates integrity checks
+    :raise 404: issue not found
     :raise 500: unexpected server error
     """
     database = get_database()
-    updated_issues = []
     errors = []
 
-    with database:
-        try:
+    issues = to_issue_list(body)
+    if not issues:
+        return payload([])
+
+    try:
+        with transaction(database):
             cursor = database.cursor()
-            for issue in to_issue_list(request):
-                if get_issue(cursor, issue["id"]) is None:
+
+            for issue in issues:
+                issue["id"] = normalize_issue_id(issue["id"])
+
+            issues = merge_patches(issues)
+            existing_ids = get_existing_issue_ids(
+                cursor,
+                [issue["id"] for issue in issues],
+            )
+
+            # Reject the batch before any issue is patched, so that nothing
+            # has been written when the transaction ends.
+            for issue in issues:
+                if issue["id"] not in existing_ids:
                     errors.append([f"issue #{issue['id']} does not exist"])
                     return payload({}, errors, 404)
-                else:
-                    updated_issues.append(
-                        patch_issue(
-                            cursor,
-                            issue["id"],
-                            issue,
-                        ),
-                    )
 
-                    # TODO: Validate database state against Prolog rules.
+            for issue in issues:
+                patch_issue(cursor, issue["id"], issue)
+
+                # TODO: Validate database state against Prolog rules.
+
+            updated_issues = get_issues(
+                cursor,
+                [issue["id"] for issue in issues],
+            )
+
+    except sqlite3.IntegrityError as error:
+        errors.append("failed to create rows in sqlite")
+        errors.append(str(error))
+        return payload({}, errors, 400)
+
+    except Exception as error:
+        errors.append("unexpected server error")
+        errors.append(str(error))
+        return payload({}, errors, 500)
+
+    # Patched issues are returned in payload order.
+    return payload([updated_issues[issue["id"]] for issue in issues])
 
-        except sqlite3.IntegrityError as error:
-            errors.append("failed to create rows in sqlite")
-            errors.append(str(error))
-            return payload({}, errors, 400)
 
-        except Exception as error:
-            errors.append("unexpected server error")
-            errors.append(str(error))
-            return payload({}, errors, 500)
+def merge_patches(issues):
+    """Helper function that merges patches to the same issue.
 
-    return updated_issues
+    Patches carry partial sets of fields, so repeated ids are merged rather
+    than replaced, in payload order: a later title or description overrides
+    an earlier one, and tag patches are concatenated so that they are still
+    applied in the order they were sent.
+
+    :param issues: list of issue patches
+    :return: list of patches with one patch per issue id
+    """
+    patches = {}
+    for issue in issues:
+        patch = patches.setdefault(issue["id"], {})
+        for key, value in issue.items():
+            if key == "tags":
+                patch["tags"] = patch.get("tags", []) + value
+            else:
+                patch[key] = value
+
+    return list(patches.values())
 
 
 def patch_issue(cursor, id, fields):
@@ -511,86 +674,67 @@ def patch_issue(cursor, id, fields):
     :param id: issue id
     :param fields: dict of fields values
     """
-    def generate_set_clause(field_names):
-        """
-        Construct a variadic SET clause for an UPDATE query (in terms of
-        DB API parameter substitutions) based on the number of fields
-        that will get updated.
-        """
-        return "SET " + ",".join(map(
-            lambda key: f"{key} = ?",
-            field_names,
-        ))
-
-    # Update issue fields.
-    fields_to_update = {
-        key: fields[key]
-        for key in ["title", "description"]
-        if key in fields
-    }
-    cursor.execute(
-        f"""
-        UPDATE issue
-        {generate_set_clause(fields_to_update.keys())}
-        WHERE id = ?
-        """, (*fields_to_update.values(), (str(id),))
-    )
+    # Update issue fields. Fields missing from the patch are bound as NULL
+    # and keep their current value, so one prepared statement covers every
+    # combination of patched fields.
+    if "title" in fields or "description" in fields:
+        cursor.execute(
+            """
+            UPDATE issue
+            SET
+                title = COALESCE(?, title),
+                description = COALESCE(?, description)
+            WHERE id = ?
+            """, (fields.get("title"), fields.get("description"), id),
+        )
 
-    # Update issue tags.
+    # Update issue tags. New tags are collected and inserted in one batch.
+    new_tags = []
     for tag in fields.get("tags", []):
         if "id" in tag:
-            fields_to_update = {
-                key: tag[key]
+            # Missing or empty tag fields keep their current value.
+            tag_values = [
+                None if tag.get(key) == "" else tag.get(key)
                 for key in ["namespace", "predicate", "value"]
-                if key in tag and tag[key] != ""
-            }
-            if len(fields_to_update) > 0:
+            ]
+            if any(value is not None for value in tag_values):
                 # Patch an existing tag's fields.
                 cursor.execute(
-                    f"""
+                    """
                     UPDATE tag
-                    {generate_set_clause(fields_to_update.keys())}
+                    SET
+                        namespace = COALESCE(?, namespace),
+                        predicate = COALESCE(?, predicate),
+                        value = COALESCE(?, value)
                     WHERE id = ? AND issue_id = ?
-                    """, (
-                        *fields_to_update.values(),
-                        tag["id"],
-                        str(id),
-                    )
+                    """, (*tag_values, tag["id"], id),
                 )
             else:
                 # Remove the tag if there are no fields to update.
                 cursor.execute("DELETE FROM tag WHERE id = ?", (tag["id"],))
         else:
             # Add a new tag if a tag id was not provided.
-            cursor.execute(
-                """
-                INSERT INTO tag (namespace, predicate, value, issue_id)
-                VALUES (?, ?, ?, ?)
-                """, (
-                    tag["namespace"],
-                    tag["predicate"],
-                    tag["value"],
-                    str(id),
-                ),
+            new_tags.append(
+                (tag["namespace"], tag["predicate"], tag["value"], id),
             )
 
-    return get_issue(cursor, id)
+    cursor.executemany(INSERT_TAG_SQL, new_tags)
 
 
 @blueprint.route("/api/issue/<int:id>", methods=["DELETE"])
 def delete_issue_route(id):
     database = get_database()
-    with database:
-        try:
+    try:
+        with transaction(database):
             cursor = database.cursor()
             cursor.execute("DELETE FROM issue WHERE id = ?", (id, ))
             cursor.execute("DELETE FROM tag WHERE issue_id = ?", (id, ))
 
-        except Exception as error:
-            errors = []
-            errors.append("unexpected server error")
-            errors.append(str(error))
-            return payload({}, errors, 500)
+    except Exception as error:
+        errors = []
+        errors.append("unexpected server error")
+        errors.append(str(error))
+        return payload({}, errors, 500)
 
     return payload()
 
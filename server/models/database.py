@@ -1,35 +1,132 @@
+import contextlib
 import sqlite3
+import threading
 
-from flask import current_app, g
+from flask import current_app
+
+# Connections are kept open for the lifetime of the thread that opened them,
+# keyed by database path. sqlite3 connections may not be shared across
+# threads, so each worker thread holds its own.
+_local = threading.local()
+
+
+# Recorded in the database's user_version once the schema has been applied.
+# Bump this whenever models/schema.sql changes so that existing databases
+# pick up the change on the next startup.
+SCHEMA_VERSION = 2
 
 
 def init_database(app):
     """
     Create SQLite tables in the database if they don't already exist. Intended
-    to be called from within the application factory.
+    to be called from within the application factory. The schema script is
+    skipped when the database already records the current schema version.
 
     :param app: Flask instance
     """
-    with app.open_resource("models/schema.sql") as f:
-        connection = sqlite3.connect(app.config["DATABASE"])
-        connection.executescript(f.read().decode("utf-8"))
-        connection.close()
+    connection = sqlite3.connect(app.config["DATABASE"])
+    configure_connection(connection)
+
+    (version,) = connection.execute("PRAGMA user_version").fetchone()
+    if version < SCHEMA_VERSION:
+        with app.open_resource("models/schema.sql") as f:
+            connection.executescript(f.read().decode("utf-8"))
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    connection.close()
+
+
+def configure_connection(connection):
+    """
+    Apply performance PRAGMAs to a SQLite connection. The journal mode is
+    persisted in the database file; the remaining settings only last for the
+    lifetime of the connection.
+
+    :param connection: sqlite3 connection
+    """
+    # Write-ahead logging lets readers proceed concurrently with a writer,
+    # and with synchronous=NORMAL a commit no longer waits on an fsync (the
+    # WAL is only synced at checkpoints). A committed transaction may be
+    # rolled back by a power loss, but the database cannot become corrupt.
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.execute("PRAGMA synchronous = NORMAL")
+    connection.execute("PRAGMA temp_store = MEMORY")
+    connection.execute("PRAGMA cache_size = -64000")
+
+    # Read database pages through a memory map of up to 256 MB instead of
+    # copying them into the page cache with read().
+    connection.execute("PRAGMA mmap_size = 268435456")
+
+
+def connect_database(path):
+    """Open a SQLite connection configured for use by the application.
+
+    :param path: database file path
+    :return: sqlite3 connection
+    """
+    # Transactions are managed explicitly with `transaction`, so the sqlite3
+    # module's implicit BEGIN before each write statement is disabled.
+    connection = sqlite3.connect(path, isolation_level=None)
+    connection.row_factory = sqlite3.Row
+    configure_connection(connection)
+    return connection
+
+
+def get_connections():
+    """Get the connections opened by the current thread, keyed by path."""
+    if not hasattr(_local, "connections"):
+        _local.connections = {}
+
+    return _local.connections
 
 
 def get_database():
-    """Get a SQLite database connection from the application context."""
-    if "database" not in g:
-        g.database = sqlite3.connect(current_app.config["DATABASE"])
-        g.database.row_factory = sqlite3.Row
+    """
+    Get the current thread's SQLite database connection. The connection is
+    opened on first use and reused by every later request served by the same
+    thread, so connecting and applying PRAGMAs happens once per thread rather
+    than once per request.
+    """
+    connections = get_connections()
+    path = current_app.config["DATABASE"]
+    if path not in connections:
+        connections[path] = connect_database(path)
 
-    return g.database
+    return connections[path]
+
+
+@contextlib.contextmanager
+def transaction(database):
+    """
+    Run a block of statements in a single write transaction. The write lock
+    is taken up front with BEGIN IMMEDIATE; the transaction is committed when
+    the block exits normally and rolled back if it raises.
+
+    :param database: sqlite3 connection
+    """
+    database.execute("BEGIN IMMEDIATE")
+    try:
+        yield database
+    except BaseException:
+        # SQLite rolls the transaction back by itself after some errors (disk
+        # full, I/O error, interrupt). rollback() does nothing when no
+        # transaction is open, where a ROLLBACK statement would raise and
+        # hide the original error.
+        database.rollback()
+        raise
+    else:
+        database.execute("COMMIT")
 
 
 def close_database(exception=None):
-    """Close the database connection resource in the application context."""
-    database = g.pop("database", None)
-    if database is not None:
-        database.close()
+    """
+    Release the database connection at the end of the application context.
+    The connection stays open for reuse; a transaction left open by the
+    request is rolled back so the next request starts from a clean state.
+    """
+    database = get_connections().get(current_app.config["DATABASE"])
+    if database is not None and database.in_transaction:
+        database.rollback()
 
 
 def init_app(app):
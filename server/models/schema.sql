@@ -25,3 +25,12 @@ CREATE TABLE IF NOT EXISTS tag (
 	CHECK (value <> "")
 );
 
+
+-- Tags are looked up by issue when fetching, replacing, and deleting issues.
+-- The index also carries every tag column that an issue fetch reads, so the
+-- fetch is answered from the index without visiting the tag table; the tag
+-- id that fetches order by is the rowid, which every index entry carries. It
+-- supersedes the earlier single-column index on issue_id.
+DROP INDEX IF EXISTS idx_tag_issue_id;
+CREATE INDEX IF NOT EXISTS idx_tag_issue_covering
+	ON tag (issue_id, namespace, predicate, value);
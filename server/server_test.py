@@ -0,0 +1,314 @@
+import sqlite3
+
+import pytest
+
+from server import create_app
+from server.issue import MAX_ROWID
+
+# KNOWN DEFECT: the PATCH route is registered as "/api/issue<int:id>",
+# without the slash the other routes have, and it ignores the id in the URL;
+# issues are patched by the ids in the body. The tests send PATCH requests to
+# that URL only because it is what the route currently matches; it is not
+# the intended API.
+PATCH_URL = "/api/issue1"
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Application backed by a fresh SQLite database."""
+    return create_app({"DATABASE": str(tmp_path / "tissue.sqlite")})
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def tag(value, namespace="namespace", predicate="predicate"):
+    return {"namespace": namespace, "predicate": predicate, "value": value}
+
+
+def create(client, *issues):
+    """Create issues through POST and return their ids."""
+    response = client.post("/api/issue", json=[
+        {"id": 0, **issue} for issue in issues
+    ])
+    assert response.status_code == 200
+    return [issue["id"] for issue in response.get_json()["data"]]
+
+
+def fetch(client, id):
+    response = client.get(f"/api/issue/{id}")
+    assert response.status_code == 200
+    return response.get_json()["data"]
+
+
+def test_get_issue(client):
+    (id,) = create(client, {"title": "a", "tags": [tag("x"), tag("y")]})
+
+    assert fetch(client, id) == {
+        "id": id,
+        "title": "a",
+        "description": "",
+        "tags": [tag("x"), tag("y")],
+    }
+
+
+def test_get_missing_issue(client):
+    response = client.get("/api/issue/1")
+
+    assert response.status_code == 404
+    assert response.get_json()["errors"] == ["issue #1 does not exist"]
+
+
+def test_get_issue_database_error(app, client):
+    with sqlite3.connect(app.config["DATABASE"]) as database:
+        database.execute("DROP TABLE tag")
+
+    response = client.get("/api/issue/1")
+
+    assert response.status_code == 500
+    assert response.get_json()["errors"][0] == "unexpected server error"
+
+
+def test_post_issues(client):
+    ids = create(
+        client,
+        {"title": "a", "tags": [tag("a")]},
+        {"title": "b"},
+        {"title": "c", "tags": [tag("c1"), tag("c2")]},
+    )
+
+    assert len(set(ids)) == 3
+    assert [fetch(client, id)["tags"] for id in ids] == [
+        [tag("a")], [], [tag("c1"), tag("c2")],
+    ]
+
+
+def test_tags_keep_insertion_order(client):
+    tags = [tag("z"), tag("a"), tag(1, predicate="a")]
+
+    response = client.post("/api/issue", json={
+        "id": 0,
+        "title": "a",
+        "tags": tags,
+    })
+    assert response.status_code == 200
+    id = response.get_json()["data"][0]["id"]
+    assert fetch(client, id)["tags"] == [
+        tag("z"), tag("a"), tag("1", predicate="a"),
+    ]
+
+    response = client.put("/api/issue", json=[
+        {"id": id, "title": "a", "tags": tags},
+        {"id": id + 1, "title": "b", "tags": [tag("z"), tag("a")]},
+    ])
+    assert response.status_code == 200
+    assert response.get_json()["data"] == [
+        fetch(client, id),
+        fetch(client, id + 1),
+    ]
+    assert fetch(client, id + 1)["tags"] == [tag("z"), tag("a")]
+
+
+def test_post_issues_after_max_rowid(app, client):
+    response = client.put("/api/issue", json={
+        "id": MAX_ROWID - 1,
+        "title": "last",
+    })
+    assert response.status_code == 200
+
+    ids = create(
+        client,
+        *({"title": title, "tags": [tag(title)]} for title in "abc"),
+    )
+
+    for id, title in zip(ids, "abc"):
+        assert fetch(client, id)["tags"] == [tag(title)]
+
+    with sqlite3.connect(app.config["DATABASE"]) as database:
+        orphaned_tags = database.execute(
+            """
+            SELECT COUNT(*) FROM tag
+            WHERE issue_id NOT IN (SELECT id FROM issue)
+            """
+        ).fetchone()[0]
+    assert orphaned_tags == 0
+
+
+def test_put_creates_issue(client):
+    response = client.put("/api/issue", json={
+        "id": 5,
+        "title": "a",
+        "tags": [tag("x")],
+    })
+
+    assert response.status_code == 200
+    assert response.get_json()["data"] == [fetch(client, 5)]
+
+
+def test_put_replaces_issue(client):
+    (id,) = create(client, {
+        "title": "a",
+        "description": "d",
+        "tags": [tag("x")],
+    })
+
+    response = client.put("/api/issue", json={"id": str(id), "title": "b"})
+
+    assert response.status_code == 200
+    assert fetch(client, id) == {
+        "id": id,
+        "title": "b",
+        "description": "",
+        "tags": [],
+    }
+    assert response.get_json()["data"] == [fetch(client, id)]
+
+
+def test_put_out_of_range_id(client):
+    response = client.put("/api/issue", json={
+        "id": "99999999999999999999",
+        "title": "a",
+    })
+
+    assert response.status_code == 400
+
+
+def test_put_returns_stored_numeric_tag_values(client):
+    response = client.put("/api/issue", json={
+        "id": 1,
+        "title": "a",
+        "tags": [tag(0.1 + 0.2, predicate="a"), tag(1e20, predicate="b")],
+    })
+
+    assert response.status_code == 200
+    assert response.get_json()["data"] == [fetch(client, 1)]
+
+
+def test_delete_issue(client):
+    (id, other_id) = create(
+        client,
+        {"title": "a", "tags": [tag("x")]},
+        {"title": "b", "tags": [tag("x")]},
+    )
+
+    response = client.delete(f"/api/issue/{id}")
+
+    assert response.status_code == 200
+    assert client.get(f"/api/issue/{id}").status_code == 404
+    assert fetch(client, other_id)["tags"] == [tag("x")]
+
+
+@pytest.mark.parametrize("data, content_type", [
+    ('{"id": 0, "title": "a"}', "text/plain"),
+    ('{"id": 0, "title": "a"', "application/json"),
+    ('{"id": 0}', "application/json"),
+    ('{"id": 0, "title": 1}', "application/json"),
+])
+def test_post_invalid_payload(client, data, content_type):
+    response = client.post("/api/issue", data=data, content_type=content_type)
+
+    assert response.status_code == 400
+    assert response.get_json() == {
+        "data": {},
+        "errors": ["invalid json payload"],
+    }
+    assert client.get("/api/issue/1").status_code == 404
+
+
+@pytest.mark.parametrize("method, body", [
+    ("put", []),
+    ("put", {"title": "a"}),
+    ("put", {"id": 1.5, "title": "a"}),
+    ("patch", []),
+    ("patch", {"id": 1, "tags": {}}),
+])
+def test_write_schema_violation(client, method, body):
+    url = PATCH_URL if method == "patch" else "/api/issue"
+    response = getattr(client, method)(url, json=body)
+
+    assert response.status_code == 400
+    assert response.get_json()["errors"] == ["invalid json payload"]
+
+
+def test_patch_title(client):
+    (id,) = create(client, {"title": "a", "tags": [tag("x")]})
+
+    response = client.patch(PATCH_URL, json={"id": id, "title": "b"})
+
+    assert response.status_code == 200
+    assert fetch(client, id) == {
+        "id": id,
+        "title": "b",
+        "description": "",
+        "tags": [tag("x")],
+    }
+
+
+def test_patch_tags(client):
+    (id,) = create(client, {"title": "a", "description": "d"})
+
+    response = client.patch(PATCH_URL, json={
+        "id": id,
+        "tags": [tag("x")],
+    })
+
+    assert response.status_code == 200
+    assert fetch(client, id) == {
+        "id": id,
+        "title": "a",
+        "description": "d",
+        "tags": [tag("x")],
+    }
+
+
+def test_patch_merges_repeated_ids(client):
+    (id,) = create(client, {"title": "a"})
+
+    response = client.patch(PATCH_URL, json=[
+        {"id": id, "title": "b"},
+        {"id": str(id), "tags": [tag("x")]},
+    ])
+
+    assert response.status_code == 200
+    assert fetch(client, id)["title"] == "b"
+    assert fetch(client, id)["tags"] == [tag("x")]
+
+
+def test_patch_decimal_string_id(client):
+    (id,) = create(client, {"title": "a"})
+
+    response = client.patch(PATCH_URL, json={
+        "id": f"{id}.0",
+        "title": "b",
+    })
+
+    assert response.status_code == 200
+    assert fetch(client, id)["title"] == "b"
+
+
+def test_patch_response_keeps_payload_order(client):
+    ids = create(client, {"title": "a"}, {"title": "b"})
+
+    response = client.patch(PATCH_URL, json=[
+        {"id": ids[1], "title": "d"},
+        {"id": ids[0], "title": "c"},
+    ])
+
+    assert response.status_code == 200
+    assert [issue["id"] for issue in response.get_json()["data"]] == [
+        ids[1], ids[0],
+    ]
+
+
+def test_patch_missing_issue_writes_nothing(client):
+    (id,) = create(client, {"title": "a"})
+
+    response = client.patch(PATCH_URL, json=[
+        {"id": id, "title": "b"},
+        {"id": id + 1, "title": "c"},
+    ])
+
+    assert response.status_code == 404
+    assert fetch(client, id)["title"] == "a"